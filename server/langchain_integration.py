@@ -1,290 +1,685 @@
-from langchain_openai import OpenAI
-from langchain.prompts import PromptTemplate
-from langchain.chains import LLMChain
+import openai
 from weather_service import WeatherService
-import os
+from settings import get_settings
+import asyncio
+import json
 import logging
-from dotenv import load_dotenv
-
-load_dotenv()
+from bisect import bisect_left, bisect_right
+from aiolimiter import AsyncLimiter
+from cachetools import TTLCache
+from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Prompt templates are plain format strings rendered with str.format - the
+# LangChain PromptTemplate/chain wrappers only added Python overhead on top
+# of the same OpenAI API call
+_INSIGHTS_PROMPT = """
+Based on the current weather conditions in {location}:
+- Temperature: {temperature}°C
+- Conditions: {description}
+- Humidity: {humidity}%
+- Wind Speed: {wind_speed} m/s
+
+Provide practical insights and recommendations for {activity}.
+Consider safety, comfort, and optimal timing.
+Be specific and actionable in your advice.
+
+Insights:
+"""
+
+_SUMMARY_ADVISORY_PROMPT = """
+Based on the current weather conditions in {location}:
+- Temperature: {temperature}°C
+- Conditions: {description}
+- Humidity: {humidity}%
+- Wind Speed: {wind_speed} m/s
+
+Produce two pieces of content:
+
+1. "summary": A concise, professional 2-3 sentence weather summary that captures
+the current conditions and general comfort level. Focus on what people would
+experience if they stepped outside right now.
+
+2. "advisory": Specific travel and safety advisories covering:
+- Transportation considerations (driving, walking, public transport)
+- What to wear and bring
+- Health and safety precautions
+- Best times for outdoor activities
+- Any weather-related warnings or alerts
+Be practical and specific. Use emojis for visual appeal.
+
+Respond with strict JSON containing only the keys "summary" and "advisory".
+
+JSON Response:
+"""
+
+# Model parameters shared by all live completion paths
+_CHAT_MODEL = "gpt-4o-mini"
+_MAX_TOKENS = 500
+_TEMPERATURE = 0.7
+
+# Keyword tables for the mock generators - scanning the lowered description
+# once and branching on the matched token set avoids repeated str.lower()
+# allocations and substring scans per call
+_CONDITION_KEYWORDS = ("rain", "snow", "cloud", "clear", "sunny", "sun")
+
+_CONDITION_INSIGHTS = {
+    "rain": "🌧️ Rainy conditions - bring umbrella and waterproof gear.",
+    "snow": "❄️ Snowy conditions - wear non-slip footwear and drive carefully.",
+    "cloud": "☁️ Cloudy skies - good for outdoor activities without strong sun.",
+    "clear": "☀️ Clear skies - don't forget sunscreen and sunglasses.",
+    "sunny": "☀️ Clear skies - don't forget sunscreen and sunglasses.",
+}
+
+# Only the first matching condition contributes an insight
+_CONDITION_PRECEDENCE = ("rain", "snow", "cloud", "clear", "sunny")
+
+# Threshold/table pairs replace the duplicated if/elif ladders over
+# temperature, humidity and wind - one bisect plus a tuple index instead of
+# 4-5 comparisons per value
+_TEMP_THRESHOLDS = (0, 10, 20, 30)
+_TEMP_INSIGHTS = (
+    "⚠️ Freezing conditions - dress warmly and watch for ice.",
+    "🧥 Cold weather - layer up and consider warm beverages.",
+    "🌤️ Mild weather - light jacket recommended.",
+    "☀️ Pleasant temperature - great weather for most activities.",
+    "🌡️ Hot weather - stay hydrated and seek shade when possible.",
+)
+
+_HUMIDITY_THRESHOLDS = (30, 80)
+# The humidity boundaries run in opposite directions (> 80 high, < 30 low),
+# which a single bisect mode can't express - the mock generators keep an
+# explicit two-branch check for these
+_HUMIDITY_HIGH_INSIGHT = "💧 High humidity - expect to feel warmer than actual temperature."
+_HUMIDITY_LOW_INSIGHT = "🏜️ Low humidity - stay hydrated and consider moisturizer."
+
+_WIND_THRESHOLDS = (5, 10)
+_WIND_INSIGHTS = (
+    None,
+    "🌬️ Moderate winds - light windbreaker might be helpful.",
+    "💨 Strong winds - secure loose items and consider wind-resistant clothing.",
+)
+
+_SUMMARY_TEMP_THRESHOLDS = (0, 10, 25)
+_SUMMARY_TEMPLATES = (
+    "❄️ Current conditions in {location} are quite cold at {temperature}°C with {description}. Bundle up warmly as freezing temperatures can be uncomfortable for extended outdoor exposure.",
+    "🧥 {location} is experiencing cool weather at {temperature}°C with {description}. A warm jacket will keep you comfortable during outdoor activities.",
+    "🌤️ Pleasant conditions in {location} with {temperature}°C and {description}. Ideal weather for most outdoor activities with light layers recommended.",
+    "☀️ Warm conditions in {location} at {temperature}°C with {description}. Stay hydrated and seek shade during peak sun hours.",
+)
+
+# Fixed-text fragments for the mock generators, hoisted so the hot mock path
+# (the default when no API key is set) doesn't re-allocate them per call
+_EXERCISE_HEAT = "🏃‍♂️ For exercise: Early morning or evening recommended due to heat."
+_EXERCISE_COLD = "🏃‍♂️ For exercise: Warm up indoors and dress in layers."
+_EXERCISE_GOOD = "🏃‍♂️ For exercise: Great conditions for outdoor workouts!"
+_OUTDOOR_RAIN = "🧺 For outdoor activities: Consider indoor alternatives or postpone."
+_OUTDOOR_GOOD = "🌳 For outdoor activities: Perfect weather for spending time outside!"
+
+_OVERALL_IDEAL = "These are ideal conditions for most outdoor activities!"
+_OVERALL_CHALLENGING = "Weather conditions are challenging - take extra precautions."
+_OVERALL_PLEASANT = "Generally pleasant conditions with minor considerations."
+
+_ADVISORY_TRANSPORT_RAIN = "🚗 Transportation: Exercise caution while driving due to wet road conditions. Allow extra travel time and maintain safe following distances."
+_ADVISORY_TRANSPORT_SNOW = "🚗 Transportation: Winter driving conditions present. Use winter tires if available and drive slowly on potentially icy roads."
+_ADVISORY_TRANSPORT_WIND = "🚗 Transportation: Strong winds may affect vehicle stability, especially for high-profile vehicles. Secure loose items."
+_ADVISORY_TRANSPORT_DEFAULT = "🚗 Transportation: Good driving conditions with normal precautions recommended."
+
+_ADVISORY_CLOTHING_FREEZING = "🧥 Clothing: Wear insulated winter clothing including hat, gloves, and warm boots. Layer clothing for temperature regulation."
+_ADVISORY_CLOTHING_COLD = "🧥 Clothing: Dress in warm layers with a jacket or coat. Don't forget a hat and gloves for comfort."
+_ADVISORY_CLOTHING_HOT = "👕 Clothing: Light, breathable clothing recommended. Wear sunscreen, hat, and sunglasses for sun protection."
+_ADVISORY_CLOTHING_DEFAULT = "👕 Clothing: Comfortable layered clothing suitable for current temperature. Adjust layers as needed."
+
+_ADVISORY_HEALTH_HUMID = "💧 Health: High humidity may make it feel warmer. Stay hydrated and take breaks in air-conditioned spaces if feeling overheated."
+_ADVISORY_HEALTH_DRY = "💧 Health: Low humidity may cause dry skin and respiratory discomfort. Use moisturizer and stay hydrated."
+
+_ADVISORY_SAFETY_HOT = "🌡️ Safety: Hot weather advisory - limit outdoor exposure during midday hours (11 AM - 3 PM). Drink plenty of water."
+_ADVISORY_SAFETY_COLD = "❄️ Safety: Extreme cold warning - limit outdoor exposure. Watch for signs of frostbite and hypothermia."
+
+_ADVISORY_TIMING_RAIN = "⏰ Activity Timing: Indoor activities recommended. If going outside, bring waterproof gear and umbrella."
+_ADVISORY_TIMING_HEAT = "⏰ Activity Timing: Best outdoor activity times are early morning (6-9 AM) or evening (6-8 PM) to avoid peak heat."
+_ADVISORY_TIMING_DEFAULT = "⏰ Activity Timing: Good conditions for outdoor activities throughout the day with normal precautions."
+
+_BASE_LAYER_THRESHOLDS = (0, 10, 20)
+_BASE_LAYER_RECOMMENDATIONS = (
+    "Base Layer: Thermal underwear and insulating layers",
+    "Base Layer: Long sleeves and warm pants",
+    "Base Layer: Light sweater or long sleeves",
+    "Base Layer: T-shirt or light clothing",
+)
+
+
+def _bucket(value, thresholds, table, strict_upper=False):
+    """
+    Pick the canned text for a value via a single bisect over sorted thresholds.
+    strict_upper=True reproduces `value > threshold` ladders (boundary values
+    stay in the lower bucket); the default reproduces `value < threshold` ones.
+    """
+    index = bisect_left(thresholds, value) if strict_upper else bisect_right(thresholds, value)
+    return table[index]
+
+
+def _matched_conditions(description: str) -> set:
+    """Lowercase the description once and collect the weather keywords it contains."""
+    desc = description.lower()
+    return {token for token in _CONDITION_KEYWORDS if token in desc}
+
+
+# Activity groups whose members get equivalent advice - used to give
+# structurally similar prompts ("running" vs "jogging") one cache slot
+_EXERCISE_ACTIVITIES = frozenset(("running", "jogging", "exercise", "workout"))
+_OUTDOOR_ACTIVITIES = frozenset(("picnic", "outdoor", "park", "hiking"))
+
+# Placeholder swapped for the concrete location when storing/serving
+# semantically cached insights
+_LOCATION_PLACEHOLDER = "<<LOCATION>>"
+
+
+def _activity_bucket(activity: str) -> str:
+    activity = activity.lower()
+    if activity in _EXERCISE_ACTIVITIES:
+        return "exercise"
+    if activity in _OUTDOOR_ACTIVITIES:
+        return "outdoor"
+    return activity
+
+
+def _semantic_key(weather, activity: str) -> tuple:
+    """
+    Reduce a weather snapshot + activity to coarse buckets so structurally
+    similar requests (e.g. "New York, running" vs "NYC, jogging") share one
+    cached LLM response.
+    """
+    conditions = _matched_conditions(weather.description)
+    condition = next((t for t in _CONDITION_PRECEDENCE if t in conditions), "")
+    return (
+        _activity_bucket(activity),
+        bisect_right(_TEMP_THRESHOLDS, weather.temperature),
+        bisect_left(_HUMIDITY_THRESHOLDS, weather.humidity),
+        bisect_left(_WIND_THRESHOLDS, weather.wind_speed),
+        condition,
+    )
+
+
 class WeatherLangChainService:
     def __init__(self):
         self.weather_service = WeatherService()
-        api_key = os.getenv("OPENAI_API_KEY")
+        # Weather data is stable for minutes and LLM output for the same
+        # (location, activity) pair is expensive to regenerate, so repeated
+        # queries become dict lookups instead of network calls
+        self._weather_cache = TTLCache(maxsize=1024, ttl=300)
+        self._ai_cache = TTLCache(maxsize=2048, ttl=600)
+        # Cache keyed by coarse weather/activity buckets rather than exact
+        # inputs - near-identical prompts reuse one LLM response with the
+        # location templated back in
+        self._semantic_cache = TTLCache(maxsize=512, ttl=600)
+        # Map of location -> in-flight fetch so concurrent lookups for the
+        # same location collapse into a single upstream call
+        self._inflight_weather = {}
+        settings = get_settings()
+        # Token-bucket limiter that smooths request bursts to stay under the
+        # account's requests-per-minute quota instead of tripping 429s and
+        # paying the retry penalty
+        self._limiter = AsyncLimiter(max_rate=settings.openai_rpm, time_period=60)
+        api_key = settings.openai_api_key
         
         if api_key:
-            self.llm = OpenAI(
-                api_key=api_key,
-                temperature=0.7,
-                max_tokens=500
-            )
+            # One AsyncOpenAI client shares a single HTTP connection pool
+            # across every completion call
+            self.client = openai.AsyncOpenAI(api_key=api_key)
         else:
-            self.llm = None
+            self.client = None
             logger.warning("No OpenAI API key found. AI insights will use mock responses.")
+
+    @retry(
+        retry=retry_if_exception_type(openai.RateLimitError),
+        wait=wait_exponential(multiplier=1, max=30),
+        stop=stop_after_attempt(4),
+        reraise=True
+    )
+    async def _chat_completion(self, prompt: str, response_format: dict = None) -> str:
+        """
+        Issue a single chat completion and return the generated text. Calls
+        queue on the rate limiter rather than racing into 429s; any 429 that
+        still slips through is retried with exponential backoff.
+        """
+        kwargs = {"response_format": response_format} if response_format else {}
+        async with self._limiter:
+            response = await self.client.chat.completions.create(
+                model=_CHAT_MODEL,
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=_MAX_TOKENS,
+                temperature=_TEMPERATURE,
+                **kwargs
+            )
+        return response.choices[0].message.content
     
-    async def get_weather_insights(self, location: str, activity: str = "general") -> str:
+    async def _get_cached_weather(self, location: str, refresh: bool = False):
+        """
+        Fetch weather data through the TTL cache. Concurrent misses for the
+        same location await a shared in-flight future, so a burst of N
+        identical lookups results in one upstream call.
+        """
+        key = location.lower()
+        if not refresh and key in self._weather_cache:
+            return self._weather_cache[key]
+
+        inflight = self._inflight_weather.get(key)
+        if inflight is not None:
+            return await inflight
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight_weather[key] = future
+        try:
+            weather = await self.weather_service.get_weather(location)
+            # Populate the cache before waking the waiters
+            self._weather_cache[key] = weather
+            future.set_result(weather)
+            return weather
+        except BaseException:
+            # Covers cancellation too - waiters fail fast instead of hanging
+            # on a future that will never resolve, and cancel() doesn't emit
+            # the never-retrieved warning set_exception does when nobody is
+            # awaiting yet
+            future.cancel()
+            raise
+        finally:
+            self._inflight_weather.pop(key, None)
+
+    async def get_weather_insights(self, location: str, activity: str = "general", refresh: bool = False) -> str:
         """
         Generate AI-powered weather insights and recommendations.
         """
-        # Get current weather data
-        weather = await self.weather_service.get_weather(location)
-        
-        if self.llm:
-            return await self._generate_ai_insights(weather, activity)
+        cache_key = ("insights", location.lower(), activity)
+        if not refresh and cache_key in self._ai_cache:
+            return self._ai_cache[cache_key]
+
+        weather = await self._get_cached_weather(location, refresh)
+
+        if self.client:
+            insights = await self._generate_ai_insights(weather, activity)
         else:
-            return self._generate_mock_insights(weather, activity)
-    
-    async def get_weather_summary_and_advisory(self, location: str) -> dict:
+            insights = self._generate_mock_insights(weather, activity)
+
+        self._ai_cache[cache_key] = insights
+        return insights
+
+    async def get_weather_summary_and_advisory(self, location: str, refresh: bool = False) -> dict:
         """
         Generate comprehensive weather summary and travel advisory using OpenAI.
         """
-        # Get current weather data
-        weather = await self.weather_service.get_weather(location)
-        
-        if self.llm:
-            return await self._generate_ai_summary_and_advisory(weather)
+        cache_key = ("summary_advisory", location.lower())
+        if not refresh and cache_key in self._ai_cache:
+            return self._ai_cache[cache_key]
+
+        weather = await self._get_cached_weather(location, refresh)
+
+        if self.client:
+            summary_data = await self._generate_ai_summary_and_advisory(weather)
         else:
-            return self._generate_mock_summary_and_advisory(weather)
+            summary_data = self._generate_mock_summary_and_advisory(weather)
+
+        self._ai_cache[cache_key] = summary_data
+        return summary_data
+
+    async def stream_weather_insights(self, location: str, activity: str = "general"):
+        """
+        Stream AI-powered insights as they are generated. Time-to-first-token
+        is far lower than waiting for the full completion, so long outputs
+        start rendering immediately. Yields the complete mock text in one
+        chunk when no API key is configured.
+        """
+        weather = await self._get_cached_weather(location)
+
+        if not self.client:
+            yield self._generate_mock_insights(weather, activity)
+            return
+
+        async with self._limiter:
+            stream = await self.client.chat.completions.create(
+                model=_CHAT_MODEL,
+                messages=[{
+                    "role": "user",
+                    "content": _INSIGHTS_PROMPT.format(
+                        location=weather.location,
+                        temperature=weather.temperature,
+                        description=weather.description,
+                        humidity=weather.humidity,
+                        wind_speed=weather.wind_speed,
+                        activity=activity
+                    )
+                }],
+                max_tokens=_MAX_TOKENS,
+                temperature=_TEMPERATURE,
+                stream=True
+            )
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
+
+    async def get_weather_insights_many(self, requests: list, refresh: bool = False) -> list:
+        """
+        Generate insights for multiple (location, activity) pairs in one batch.
+        The completions run concurrently (bounded by a semaphore) and share
+        the client's connection pool instead of executing serially.
+        """
+        weathers = await asyncio.gather(
+            *(self._get_cached_weather(location, refresh) for location, _ in requests)
+        )
+
+        if self.client:
+            semaphore = asyncio.Semaphore(10)
+
+            async def generate(weather, activity):
+                async with semaphore:
+                    result = await self._chat_completion(_INSIGHTS_PROMPT.format(
+                        location=weather.location,
+                        temperature=weather.temperature,
+                        description=weather.description,
+                        humidity=weather.humidity,
+                        wind_speed=weather.wind_speed,
+                        activity=activity
+                    ))
+                    return result.strip()
+
+            try:
+                return list(await asyncio.gather(
+                    *(generate(weather, activity) for weather, (_, activity) in zip(weathers, requests))
+                ))
+            except Exception as e:
+                logger.error("Error generating batched AI insights: %s", e)
+
+        return [
+            self._generate_mock_insights(weather, activity)
+            for weather, (_, activity) in zip(weathers, requests)
+        ]
+
+    async def get_weather_insights_bulk(self, requests: list, refresh: bool = False) -> list:
+        """
+        Generate insights for multiple (location, activity) pairs in a single
+        API round-trip. The completions endpoint accepts a list of prompts and
+        returns one choice per prompt, so K requests cost one request against
+        the rate limit instead of K.
+        """
+        weathers = await asyncio.gather(
+            *(self._get_cached_weather(location, refresh) for location, _ in requests)
+        )
+
+        if self.client:
+            prompts = [
+                _INSIGHTS_PROMPT.format(
+                    location=weather.location,
+                    temperature=weather.temperature,
+                    description=weather.description,
+                    humidity=weather.humidity,
+                    wind_speed=weather.wind_speed,
+                    activity=activity
+                )
+                for weather, (_, activity) in zip(weathers, requests)
+            ]
+            try:
+                async with self._limiter:
+                    response = await self.client.completions.create(
+                        model="gpt-3.5-turbo-instruct",
+                        prompt=prompts,
+                        max_tokens=_MAX_TOKENS,
+                        temperature=_TEMPERATURE
+                    )
+                # choices are not guaranteed to arrive in submission order
+                ordered = sorted(response.choices, key=lambda choice: choice.index)
+                return [choice.text.strip() for choice in ordered]
+            except Exception as e:
+                logger.error("Error generating bulk AI insights: %s", e)
+                return await self.get_weather_insights_many(requests, refresh)
+
+        return [
+            self._generate_mock_insights(weather, activity)
+            for weather, (_, activity) in zip(weathers, requests)
+        ]
     
+    async def submit_batch_insights(self, requests: list, refresh: bool = False) -> str:
+        """
+        Submit insights for many (location, activity) pairs through OpenAI's
+        Batch API. Batch jobs run against a separate rate pool at half the
+        token cost, so this is the right path for offline/nightly bulk work
+        rather than live traffic. Returns the batch id for polling.
+        """
+        if not self.client:
+            raise RuntimeError("OpenAI API key required for batch insight generation")
+
+        weathers = await asyncio.gather(
+            *(self._get_cached_weather(location, refresh) for location, _ in requests)
+        )
+
+        lines = []
+        for i, (weather, (_, activity)) in enumerate(zip(weathers, requests)):
+            lines.append(json.dumps({
+                "custom_id": str(i),
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": _CHAT_MODEL,
+                    "messages": [{
+                        "role": "user",
+                        "content": _INSIGHTS_PROMPT.format(
+                            location=weather.location,
+                            temperature=weather.temperature,
+                            description=weather.description,
+                            humidity=weather.humidity,
+                            wind_speed=weather.wind_speed,
+                            activity=activity
+                        )
+                    }],
+                    "max_tokens": _MAX_TOKENS,
+                    "temperature": _TEMPERATURE
+                }
+            }))
+
+        batch_file = await self.client.files.create(
+            file=("insights_batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=batch_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h"
+        )
+        return batch.id
+
+    async def await_batch(self, batch_id: str, poll_interval: float = 30.0) -> list:
+        """
+        Poll a submitted batch until it finishes and return the generated
+        insights ordered by submission index.
+        """
+        if not self.client:
+            raise RuntimeError("OpenAI API key required for batch insight generation")
+
+        while True:
+            batch = await self.client.batches.retrieve(batch_id)
+            if batch.status == "completed":
+                break
+            if batch.status in ("failed", "expired", "cancelled"):
+                raise RuntimeError(f"Batch {batch_id} ended with status: {batch.status}")
+            await asyncio.sleep(poll_interval)
+
+        content = await self.client.files.content(batch.output_file_id)
+        results = {}
+        for line in content.text.splitlines():
+            if not line:
+                continue
+            entry = json.loads(line)
+            results[int(entry["custom_id"])] = \
+                entry["response"]["body"]["choices"][0]["message"]["content"].strip()
+
+        return [results[i] for i in sorted(results)]
+
     async def _generate_ai_insights(self, weather, activity: str) -> str:
         """Generate insights using OpenAI."""
-        try:
-            prompt_template = PromptTemplate(
-                input_variables=["location", "temperature", "description", "humidity", "wind_speed", "activity"],
-                template="""
-Based on the current weather conditions in {location}:
-- Temperature: {temperature}°C
-- Conditions: {description}
-- Humidity: {humidity}%
-- Wind Speed: {wind_speed} m/s
-
-Provide practical insights and recommendations for {activity}. 
-Consider safety, comfort, and optimal timing. 
-Be specific and actionable in your advice.
+        semantic_key = _semantic_key(weather, activity)
+        cached = self._semantic_cache.get(semantic_key)
+        if cached is not None:
+            return cached.replace(_LOCATION_PLACEHOLDER, weather.location)
 
-Insights:
-"""
-            )
-            
-            chain = LLMChain(llm=self.llm, prompt=prompt_template)
-            
-            result = await chain.arun(
+        try:
+            result = await self._chat_completion(_INSIGHTS_PROMPT.format(
                 location=weather.location,
                 temperature=weather.temperature,
                 description=weather.description,
                 humidity=weather.humidity,
                 wind_speed=weather.wind_speed,
                 activity=activity
-            )
-            
-            return result.strip()
-            
+            ))
+
+            insights = result.strip()
+            # Store with the location templated out so other locations in the
+            # same weather/activity bucket can reuse this response
+            self._semantic_cache[semantic_key] = insights.replace(weather.location, _LOCATION_PLACEHOLDER)
+            return insights
+
         except Exception as e:
-            logger.error(f"Error generating AI insights: {e}")
+            logger.error("Error generating AI insights: %s", e)
             return self._generate_mock_insights(weather, activity)
     
     async def _generate_ai_summary_and_advisory(self, weather) -> dict:
         """Generate comprehensive weather summary and travel advisory using OpenAI."""
         try:
-            # Weather Summary Prompt
-            summary_template = PromptTemplate(
-                input_variables=["location", "temperature", "description", "humidity", "wind_speed"],
-                template="""
-Provide a concise, professional weather summary for {location} with current conditions:
-- Temperature: {temperature}°C
-- Conditions: {description}
-- Humidity: {humidity}%
-- Wind Speed: {wind_speed} m/s
-
-Create a 2-3 sentence weather summary that captures the current conditions and general comfort level.
-Focus on what people would experience if they stepped outside right now.
-
-Weather Summary:
-"""
+            result = await self._chat_completion(
+                _SUMMARY_ADVISORY_PROMPT.format(
+                    location=weather.location,
+                    temperature=weather.temperature,
+                    description=weather.description,
+                    humidity=weather.humidity,
+                    wind_speed=weather.wind_speed
+                ),
+                response_format={"type": "json_object"}
             )
-            
-            # Travel Advisory Prompt
-            advisory_template = PromptTemplate(
-                input_variables=["location", "temperature", "description", "humidity", "wind_speed"],
-                template="""
-Based on the current weather conditions in {location}:
-- Temperature: {temperature}°C
-- Conditions: {description}
-- Humidity: {humidity}%
-- Wind Speed: {wind_speed} m/s
 
-Provide specific travel and safety advisories. Include:
-1. Transportation considerations (driving, walking, public transport)
-2. What to wear and bring
-3. Health and safety precautions
-4. Best times for outdoor activities
-5. Any weather-related warnings or alerts
+            parsed = json.loads(result.strip())
 
-Be practical and specific. Use emojis for visual appeal.
-
-Travel Advisory:
-"""
-            )
-            
-            # Generate summary
-            summary_chain = LLMChain(llm=self.llm, prompt=summary_template)
-            summary = await summary_chain.arun(
-                location=weather.location,
-                temperature=weather.temperature,
-                description=weather.description,
-                humidity=weather.humidity,
-                wind_speed=weather.wind_speed
-            )
-            
-            # Generate advisory
-            advisory_chain = LLMChain(llm=self.llm, prompt=advisory_template)
-            advisory = await advisory_chain.arun(
-                location=weather.location,
-                temperature=weather.temperature,
-                description=weather.description,
-                humidity=weather.humidity,
-                wind_speed=weather.wind_speed
-            )
-            
             return {
-                "summary": summary.strip(),
-                "advisory": advisory.strip(),
+                "summary": parsed["summary"].strip(),
+                "advisory": parsed["advisory"].strip(),
                 "location": weather.location,
                 "powered_by": "OpenAI GPT"
             }
-            
+
         except Exception as e:
-            logger.error(f"Error generating AI summary and advisory: {e}")
+            logger.error("Error generating AI summary and advisory: %s", e)
             return self._generate_mock_summary_and_advisory(weather)
     
     def _generate_mock_insights(self, weather, activity: str) -> str:
         """Generate mock insights when AI is not available."""
         insights = []
-        
+        conditions = _matched_conditions(weather.description)
+
         # Temperature-based insights
-        if weather.temperature < 0:
-            insights.append("⚠️ Freezing conditions - dress warmly and watch for ice.")
-        elif weather.temperature < 10:
-            insights.append("🧥 Cold weather - layer up and consider warm beverages.")
-        elif weather.temperature < 20:
-            insights.append("🌤️ Mild weather - light jacket recommended.")
-        elif weather.temperature < 30:
-            insights.append("☀️ Pleasant temperature - great weather for most activities.")
-        else:
-            insights.append("🌡️ Hot weather - stay hydrated and seek shade when possible.")
-        
+        insights.append(_bucket(weather.temperature, _TEMP_THRESHOLDS, _TEMP_INSIGHTS))
+
         # Humidity-based insights
         if weather.humidity > 80:
-            insights.append("💧 High humidity - expect to feel warmer than actual temperature.")
+            insights.append(_HUMIDITY_HIGH_INSIGHT)
         elif weather.humidity < 30:
-            insights.append("🏜️ Low humidity - stay hydrated and consider moisturizer.")
-        
+            insights.append(_HUMIDITY_LOW_INSIGHT)
+
         # Wind-based insights
-        if weather.wind_speed > 10:
-            insights.append("💨 Strong winds - secure loose items and consider wind-resistant clothing.")
-        elif weather.wind_speed > 5:
-            insights.append("🌬️ Moderate winds - light windbreaker might be helpful.")
+        wind_insight = _bucket(weather.wind_speed, _WIND_THRESHOLDS, _WIND_INSIGHTS, strict_upper=True)
+        if wind_insight:
+            insights.append(wind_insight)
         
         # Weather condition insights
-        if "rain" in weather.description.lower():
-            insights.append("🌧️ Rainy conditions - bring umbrella and waterproof gear.")
-        elif "snow" in weather.description.lower():
-            insights.append("❄️ Snowy conditions - wear non-slip footwear and drive carefully.")
-        elif "cloud" in weather.description.lower():
-            insights.append("☁️ Cloudy skies - good for outdoor activities without strong sun.")
-        elif "clear" in weather.description.lower() or "sunny" in weather.description.lower():
-            insights.append("☀️ Clear skies - don't forget sunscreen and sunglasses.")
+        for token in _CONDITION_PRECEDENCE:
+            if token in conditions:
+                insights.append(_CONDITION_INSIGHTS[token])
+                break
         
         # Activity-specific recommendations
         if activity.lower() in ["running", "jogging", "exercise", "workout"]:
             if weather.temperature > 25:
-                insights.append("🏃‍♂️ For exercise: Early morning or evening recommended due to heat.")
+                insights.append(_EXERCISE_HEAT)
             elif weather.temperature < 5:
-                insights.append("🏃‍♂️ For exercise: Warm up indoors and dress in layers.")
+                insights.append(_EXERCISE_COLD)
             else:
-                insights.append("🏃‍♂️ For exercise: Great conditions for outdoor workouts!")
+                insights.append(_EXERCISE_GOOD)
         
         elif activity.lower() in ["picnic", "outdoor", "park", "hiking"]:
-            if "rain" in weather.description.lower():
-                insights.append("🧺 For outdoor activities: Consider indoor alternatives or postpone.")
+            if "rain" in conditions:
+                insights.append(_OUTDOOR_RAIN)
             else:
-                insights.append("🌳 For outdoor activities: Perfect weather for spending time outside!")
-        
-        # Combine insights
-        result = f"Weather Insights for {weather.location}:\n\n"
-        result += "\n".join(f"• {insight}" for insight in insights)
-        
-        # Add general recommendation
-        result += f"\n\nOverall: The current conditions are {weather.description} "
-        result += f"with a temperature of {weather.temperature}°C. "
+                insights.append(_OUTDOOR_GOOD)
         
+        # General recommendation
         if weather.temperature >= 15 and weather.temperature <= 25 and weather.humidity < 70:
-            result += "These are ideal conditions for most outdoor activities!"
+            overall = _OVERALL_IDEAL
         elif weather.temperature < 5 or weather.temperature > 35:
-            result += "Weather conditions are challenging - take extra precautions."
+            overall = _OVERALL_CHALLENGING
         else:
-            result += "Generally pleasant conditions with minor considerations."
+            overall = _OVERALL_PLEASANT
         
-        return result
+        # Single join instead of repeated += concatenation
+        return "\n".join([
+            f"Weather Insights for {weather.location}:",
+            "",
+            *(f"• {insight}" for insight in insights),
+            "",
+            f"Overall: The current conditions are {weather.description} "
+            f"with a temperature of {weather.temperature}°C. {overall}"
+        ])
     
     def _generate_mock_summary_and_advisory(self, weather) -> dict:
         """Generate mock summary and advisory when AI is not available."""
-        
+        conditions = _matched_conditions(weather.description)
+
         # Generate mock weather summary
-        if weather.temperature < 0:
-            summary = f"❄️ Current conditions in {weather.location} are quite cold at {weather.temperature}°C with {weather.description}. Bundle up warmly as freezing temperatures can be uncomfortable for extended outdoor exposure."
-        elif weather.temperature < 10:
-            summary = f"🧥 {weather.location} is experiencing cool weather at {weather.temperature}°C with {weather.description}. A warm jacket will keep you comfortable during outdoor activities."
-        elif weather.temperature < 25:
-            summary = f"🌤️ Pleasant conditions in {weather.location} with {weather.temperature}°C and {weather.description}. Ideal weather for most outdoor activities with light layers recommended."
-        else:
-            summary = f"☀️ Warm conditions in {weather.location} at {weather.temperature}°C with {weather.description}. Stay hydrated and seek shade during peak sun hours."
-            
+        summary = _bucket(weather.temperature, _SUMMARY_TEMP_THRESHOLDS, _SUMMARY_TEMPLATES).format(
+            location=weather.location,
+            temperature=weather.temperature,
+            description=weather.description
+        )
+
         # Generate mock travel advisory
         advisory_items = []
         
         # Transportation advice
-        if "rain" in weather.description.lower():
-            advisory_items.append("🚗 Transportation: Exercise caution while driving due to wet road conditions. Allow extra travel time and maintain safe following distances.")
-        elif "snow" in weather.description.lower():
-            advisory_items.append("🚗 Transportation: Winter driving conditions present. Use winter tires if available and drive slowly on potentially icy roads.")
+        if "rain" in conditions:
+            advisory_items.append(_ADVISORY_TRANSPORT_RAIN)
+        elif "snow" in conditions:
+            advisory_items.append(_ADVISORY_TRANSPORT_SNOW)
         elif weather.wind_speed > 15:
-            advisory_items.append("🚗 Transportation: Strong winds may affect vehicle stability, especially for high-profile vehicles. Secure loose items.")
+            advisory_items.append(_ADVISORY_TRANSPORT_WIND)
         else:
-            advisory_items.append("🚗 Transportation: Good driving conditions with normal precautions recommended.")
+            advisory_items.append(_ADVISORY_TRANSPORT_DEFAULT)
             
         # Clothing recommendations
         if weather.temperature < 0:
-            advisory_items.append("🧥 Clothing: Wear insulated winter clothing including hat, gloves, and warm boots. Layer clothing for temperature regulation.")
+            advisory_items.append(_ADVISORY_CLOTHING_FREEZING)
         elif weather.temperature < 10:
-            advisory_items.append("🧥 Clothing: Dress in warm layers with a jacket or coat. Don't forget a hat and gloves for comfort.")
+            advisory_items.append(_ADVISORY_CLOTHING_COLD)
         elif weather.temperature > 30:
-            advisory_items.append("👕 Clothing: Light, breathable clothing recommended. Wear sunscreen, hat, and sunglasses for sun protection.")
+            advisory_items.append(_ADVISORY_CLOTHING_HOT)
         else:
-            advisory_items.append("👕 Clothing: Comfortable layered clothing suitable for current temperature. Adjust layers as needed.")
+            advisory_items.append(_ADVISORY_CLOTHING_DEFAULT)
             
         # Health and safety
         if weather.humidity > 80:
-            advisory_items.append("💧 Health: High humidity may make it feel warmer. Stay hydrated and take breaks in air-conditioned spaces if feeling overheated.")
+            advisory_items.append(_ADVISORY_HEALTH_HUMID)
         elif weather.humidity < 30:
-            advisory_items.append("💧 Health: Low humidity may cause dry skin and respiratory discomfort. Use moisturizer and stay hydrated.")
+            advisory_items.append(_ADVISORY_HEALTH_DRY)
             
         if weather.temperature > 30:
-            advisory_items.append("🌡️ Safety: Hot weather advisory - limit outdoor exposure during midday hours (11 AM - 3 PM). Drink plenty of water.")
+            advisory_items.append(_ADVISORY_SAFETY_HOT)
         elif weather.temperature < -10:
-            advisory_items.append("❄️ Safety: Extreme cold warning - limit outdoor exposure. Watch for signs of frostbite and hypothermia.")
+            advisory_items.append(_ADVISORY_SAFETY_COLD)
             
         # Activity timing
-        if "rain" in weather.description.lower():
-            advisory_items.append("⏰ Activity Timing: Indoor activities recommended. If going outside, bring waterproof gear and umbrella.")
+        if "rain" in conditions:
+            advisory_items.append(_ADVISORY_TIMING_RAIN)
         elif weather.temperature > 25:
-            advisory_items.append("⏰ Activity Timing: Best outdoor activity times are early morning (6-9 AM) or evening (6-8 PM) to avoid peak heat.")
+            advisory_items.append(_ADVISORY_TIMING_HEAT)
         else:
-            advisory_items.append("⏰ Activity Timing: Good conditions for outdoor activities throughout the day with normal precautions.")
+            advisory_items.append(_ADVISORY_TIMING_DEFAULT)
             
         advisory = "\n\n".join(advisory_items)
         
@@ -295,26 +690,53 @@ Travel Advisory:
             "powered_by": "Mock Data (Add OpenAI API key for AI-powered insights)"
         }
     
-    async def get_outfit_recommendations(self, location: str) -> str:
+    async def get_outfit_recommendations(self, location: str, refresh: bool = False) -> str:
         """
         Generate clothing recommendations based on weather.
         """
-        weather = await self.weather_service.get_weather(location)
-        
+        cache_key = ("outfit", location.lower())
+        if not refresh and cache_key in self._ai_cache:
+            return self._ai_cache[cache_key]
+
+        weather = await self._get_cached_weather(location, refresh)
+        result = self._build_outfit(weather)
+
+        self._ai_cache[cache_key] = result
+        return result
+
+    async def get_full_report(self, location: str, activity: str = "general", refresh: bool = False) -> dict:
+        """
+        Produce weather, insights and outfit recommendations in one call.
+        The weather is fetched once and the LLM insights run as a task while
+        the outfit text is built locally, so the combined report costs one
+        weather fetch and a single LLM round-trip.
+        """
+        weather = await self._get_cached_weather(location, refresh)
+
+        if self.client:
+            insights_task = asyncio.create_task(self._generate_ai_insights(weather, activity))
+            outfit = self._build_outfit(weather)
+            insights = await insights_task
+        else:
+            outfit = self._build_outfit(weather)
+            insights = self._generate_mock_insights(weather, activity)
+
+        return {
+            "weather": weather.model_dump(),
+            "insights": insights,
+            "outfit": outfit
+        }
+
+    def _build_outfit(self, weather) -> str:
+        """Build the outfit recommendation text from a weather snapshot."""
         recommendations = []
-        
+        conditions = _matched_conditions(weather.description)
+
         # Base layer recommendations
-        if weather.temperature < 0:
-            recommendations.append("Base Layer: Thermal underwear and insulating layers")
-        elif weather.temperature < 10:
-            recommendations.append("Base Layer: Long sleeves and warm pants")
-        elif weather.temperature < 20:
-            recommendations.append("Base Layer: Light sweater or long sleeves")
-        else:
-            recommendations.append("Base Layer: T-shirt or light clothing")
+        recommendations.append(_bucket(weather.temperature, _BASE_LAYER_THRESHOLDS, _BASE_LAYER_RECOMMENDATIONS))
         
         # Outer layer recommendations
-        if "rain" in weather.description.lower():
+        if "rain" in conditions:
             recommendations.append("Outer Layer: Waterproof jacket or raincoat")
         elif weather.temperature < 5:
             recommendations.append("Outer Layer: Heavy winter coat")
@@ -327,26 +749,27 @@ Travel Advisory:
         accessories = []
         if weather.temperature < 10:
             accessories.extend(["warm hat", "gloves", "scarf"])
-        if "rain" in weather.description.lower():
+        if "rain" in conditions:
             accessories.append("umbrella")
-        if "sun" in weather.description.lower() or weather.temperature > 20:
+        if "sun" in conditions or weather.temperature > 20:
             accessories.extend(["sunglasses", "hat for sun protection"])
         
         if accessories:
             recommendations.append(f"Accessories: {', '.join(accessories)}")
         
         # Footwear
-        if "snow" in weather.description.lower():
+        if "snow" in conditions:
             recommendations.append("Footwear: Insulated, waterproof boots with good traction")
-        elif "rain" in weather.description.lower():
+        elif "rain" in conditions:
             recommendations.append("Footwear: Waterproof shoes or boots")
         elif weather.temperature > 25:
             recommendations.append("Footwear: Breathable, comfortable shoes")
         else:
             recommendations.append("Footwear: Weather-appropriate closed-toe shoes")
         
-        result = f"Outfit Recommendations for {weather.location}:\n"
-        result += f"Current conditions: {weather.description}, {weather.temperature}°C\n\n"
-        result += "\n".join(f"• {rec}" for rec in recommendations)
-        
-        return result
+        return "\n".join([
+            f"Outfit Recommendations for {weather.location}:",
+            f"Current conditions: {weather.description}, {weather.temperature}°C",
+            "",
+            *(f"• {rec}" for rec in recommendations)
+        ])
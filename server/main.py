@@ -1,10 +1,6 @@
 import uvicorn
 from mcp_server import MCPServer
-import os
-from dotenv import load_dotenv
-
-# Load environment variables at module level (works with direct uvicorn calls)
-load_dotenv()
+from settings import get_settings
 
 def create_app():
     """Create and configure the FastAPI application."""
@@ -15,7 +11,8 @@ def create_app():
         print(f"Error creating MCP server: {e}")
         # Import FastAPI directly as fallback
         from fastapi import FastAPI
-        fallback_app = FastAPI(title="MCP Server - Error State")
+        from fastapi.responses import ORJSONResponse
+        fallback_app = FastAPI(title="MCP Server - Error State", default_response_class=ORJSONResponse)
         
         @fallback_app.get("/")
         async def root():
@@ -31,10 +28,11 @@ def create_app():
 app = create_app()
 
 if __name__ == "__main__":
-    # Railway-compatible configuration
-    host = os.getenv("MCP_SERVER_HOST", "0.0.0.0")  # Bind to all interfaces for cloud deployment
-    port = int(os.getenv("PORT", os.getenv("MCP_SERVER_PORT", 8000)))  # Railway uses PORT env var
-    
+    # Railway-compatible configuration, snapshotted once from the environment
+    settings = get_settings()
+    host = settings.host
+    port = settings.port
+
     print(f"Starting MCP Weather Server on {host}:{port}")
     print("Available endpoints:")
     print(f"  - Health check: http://{host}:{port}/health")
@@ -43,13 +41,52 @@ if __name__ == "__main__":
     print(f"  - API Documentation: http://{host}:{port}/docs")
     
     # Production-ready configuration for Railway
-    reload_setting = os.getenv("RAILWAY_ENVIRONMENT") != "production"
+    reload_setting = settings.reload
     
+    # Opt-in io_uring-backed serving (USE_IO_URING=1) via granian's Rust
+    # runtime. asyncio has no stable io_uring loop yet, so this stays behind
+    # an env flag and an optional dependency; without granian (or on other
+    # platforms) we fall back to uvloop below, the fastest widely-deployed
+    # event loop.
+    if settings.use_io_uring:
+        try:
+            from granian import Granian
+            from granian.constants import Interfaces
+        except ImportError:
+            print("USE_IO_URING=1 but granian is not installed; falling back to uvloop")
+        else:
+            Granian(
+                "main:app",
+                address=host,
+                port=port,
+                interface=Interfaces.ASGI,
+                workers=settings.workers,
+            ).serve()
+            raise SystemExit(0)
+
+    # uvloop and httptools replace the default event loop and HTTP parser
+    # with C implementations; fall back to uvicorn's auto-detection on
+    # platforms (e.g. Windows) where uvloop isn't available
+    try:
+        import uvloop  # noqa: F401
+        loop_impl, http_impl = "uvloop", "httptools"
+    except ImportError:
+        loop_impl, http_impl = "auto", "auto"
+
     uvicorn.run(
         "main:app",
         host=host,
         port=port,
         reload=reload_setting,  # Disable reload in production
         reload_dirs=["./"] if reload_setting else None,
+        workers=None if reload_setting else settings.workers,  # Scale across cores in production
+        loop=loop_impl,
+        http=http_impl,
+        # Hold idle connections open across polling intervals so clients
+        # reuse them instead of re-handshaking, and ping WebSocket peers
+        # often enough that proxies don't silently drop quiet sessions
+        timeout_keep_alive=75,
+        ws_ping_interval=20,
+        ws_ping_timeout=20,
         log_level="info"
     )
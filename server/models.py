@@ -13,7 +13,8 @@ class MCPMethod(str, Enum):
 
 class MCPRequest(BaseModel):
     jsonrpc: str = "2.0"
-    id: Union[str, int]
+    # Notifications are requests without an id per JSON-RPC 2.0
+    id: Optional[Union[str, int]] = None
     method: str
     params: Optional[Dict[str, Any]] = None
 
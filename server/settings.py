@@ -0,0 +1,41 @@
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Immutable snapshot of the environment, read once per process."""
+    host: str
+    port: int
+    reload: bool
+    is_production: bool
+    workers: int
+    use_io_uring: bool
+    openai_rpm: int
+    openai_api_key: Optional[str]
+    weather_api_key: Optional[str]
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Scan the environment once and memoize the result so startup paths and
+    service constructors don't re-probe os.environ on every instantiation.
+    """
+    is_production = os.getenv("RAILWAY_ENVIRONMENT") == "production"
+    return Settings(
+        host=os.getenv("MCP_SERVER_HOST", "0.0.0.0"),  # Bind to all interfaces for cloud deployment
+        port=int(os.getenv("PORT", os.getenv("MCP_SERVER_PORT", 8000))),  # Railway uses PORT env var
+        reload=not is_production,
+        is_production=is_production,
+        workers=int(os.getenv("WEB_CONCURRENCY", 2)),
+        use_io_uring=os.getenv("USE_IO_URING") == "1",
+        openai_rpm=int(os.getenv("OPENAI_RPM", 500)),
+        openai_api_key=os.getenv("OPENAI_API_KEY"),
+        weather_api_key=os.getenv("OPENWEATHERMAP_API_KEY") or os.getenv("WEATHER_API_KEY"),
+    )
@@ -1,7 +1,10 @@
+import asyncio
 import httpx
 import json
 import logging
+from functools import lru_cache
 from typing import Dict, Optional
+from cachetools import TTLCache
 from models import WeatherResponse
 import os
 from dotenv import load_dotenv
@@ -11,89 +14,162 @@ load_dotenv()
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Mock catalogue for demo mode, frozen at module load. The imperial variant
+# is precomputed so the fallback path is a single dict lookup with no
+# per-call conversion arithmetic.
+_MOCK_DEFAULT = {"temperature": 20.0, "description": "partly cloudy", "humidity": 60, "wind_speed": 3.0}
+_MOCK = {
+    "new york": {"temperature": 22.5, "description": "partly cloudy", "humidity": 65, "wind_speed": 3.2},
+    "london": {"temperature": 15.8, "description": "light rain", "humidity": 78, "wind_speed": 4.1},
+    "tokyo": {"temperature": 28.3, "description": "sunny", "humidity": 52, "wind_speed": 2.8},
+    "paris": {"temperature": 18.7, "description": "overcast", "humidity": 71, "wind_speed": 3.5},
+    "sydney": {"temperature": 25.1, "description": "clear sky", "humidity": 58, "wind_speed": 4.5},
+}
+
+
+def _to_imperial(entry: Dict) -> Dict:
+    converted = dict(entry)
+    converted["temperature"] = round(entry["temperature"] * 9 / 5 + 32, 1)
+    return converted
+
+
+_MOCK_IMPERIAL = {name: _to_imperial(entry) for name, entry in _MOCK.items()}
+_MOCK_IMPERIAL_DEFAULT = _to_imperial(_MOCK_DEFAULT)
+
+
+@lru_cache(maxsize=1024)
+def _title_cached(location: str) -> str:
+    return location.title()
+
+# Shared HTTP client so all service instances reuse one keep-alive connection
+# pool instead of paying a TCP handshake per request
+_CLIENT: Optional[httpx.AsyncClient] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Lazily create the process-wide HTTP client."""
+    global _CLIENT
+    if _CLIENT is None or _CLIENT.is_closed:
+        _CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+            timeout=10.0
+        )
+    return _CLIENT
+
+
+async def close_shared_client():
+    """Close the shared HTTP client; wired to app shutdown."""
+    global _CLIENT
+    if _CLIENT is not None and not _CLIENT.is_closed:
+        await _CLIENT.aclose()
+    _CLIENT = None
+
+
 class WeatherService:
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         # Try both possible environment variable names
         self.api_key = os.getenv("OPENWEATHERMAP_API_KEY") or os.getenv("WEATHER_API_KEY")
         self.base_url = "http://api.openweathermap.org/data/2.5"
-        
+        self._client = client
+        # Weather changes on the order of minutes, not per request, so
+        # upstream results are cached in-process. The caches hold futures:
+        # concurrent misses for the same key await the fetch that is already
+        # running instead of each hitting the API.
+        self._weather_cache = TTLCache(maxsize=4096, ttl=300)
+        self._forecast_cache = TTLCache(maxsize=4096, ttl=1800)
+
         if not self.api_key:
             logger.warning("No OpenWeatherMap API key found. Using mock weather data.")
-        
+
     async def get_weather(self, location: str, units: str = "metric") -> WeatherResponse:
         """
-        Fetch weather data for a given location.
-        If no API key is provided, returns mock data for demonstration.
+        Fetch weather data for a given location, serving repeats from a
+        5-minute TTL cache. If no API key is provided, returns mock data
+        for demonstration.
         """
         if not self.api_key:
             return self._get_mock_weather(location, units)
-            
+
+        key = (location.lower(), units)
+        future = self._weather_cache.get(key)
+        if future is not None:
+            return await future
+
+        future = asyncio.get_running_loop().create_future()
+        self._weather_cache[key] = future
+        try:
+            result = await self._fetch_weather(location, units)
+        except BaseException:
+            # Don't leave waiters hung on a future that will never resolve
+            self._weather_cache.pop(key, None)
+            future.cancel()
+            raise
+        future.set_result(result)
+        return result
+
+    async def _fetch_weather(self, location: str, units: str) -> WeatherResponse:
+        """Uncached upstream fetch; falls back to mock data on any error."""
         try:
-            async with httpx.AsyncClient() as client:
-                url = f"{self.base_url}/weather"
-                params = {
-                    "q": location,
-                    "appid": self.api_key,
-                    "units": units
-                }
-                
-                response = await client.get(url, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                return WeatherResponse(
-                    location=data["name"],
-                    temperature=data["main"]["temp"],
-                    description=data["weather"][0]["description"],
-                    humidity=data["main"]["humidity"],
-                    wind_speed=data["wind"]["speed"],
-                    units=units
-                )
+            client = self._client or get_shared_client()
+            url = f"{self.base_url}/weather"
+            params = {
+                "q": location,
+                "appid": self.api_key,
+                "units": units
+            }
+
+            response = await client.get(url, params=params)
+            response.raise_for_status()
+
+            data = response.json()
+
+            return WeatherResponse(
+                location=data["name"],
+                temperature=data["main"]["temp"],
+                description=data["weather"][0]["description"],
+                humidity=data["main"]["humidity"],
+                wind_speed=data["wind"]["speed"],
+                units=units
+            )
         except Exception as e:
-            logger.warning(f"Error fetching weather data from API: {e}. Falling back to mock data.")
+            logger.warning("Error fetching weather data from API: %s. Falling back to mock data.", e)
             return self._get_mock_weather(location, units)
     
     def _get_mock_weather(self, location: str, units: str) -> WeatherResponse:
         """
         Returns mock weather data for demonstration purposes.
         """
-        mock_data = {
-            "new york": {"temp": 22.5, "desc": "partly cloudy", "humidity": 65, "wind": 3.2},
-            "london": {"temp": 15.8, "desc": "light rain", "humidity": 78, "wind": 4.1},
-            "tokyo": {"temp": 28.3, "desc": "sunny", "humidity": 52, "wind": 2.8},
-            "paris": {"temp": 18.7, "desc": "overcast", "humidity": 71, "wind": 3.5},
-            "sydney": {"temp": 25.1, "desc": "clear sky", "humidity": 58, "wind": 4.5},
-        }
-        
-        location_key = location.lower()
-        if location_key in mock_data:
-            data = mock_data[location_key]
-        else:
-            # Default mock data for unknown locations
-            data = {"temp": 20.0, "desc": "partly cloudy", "humidity": 60, "wind": 3.0}
-        
-        # Convert temperature if units are imperial
-        temperature = data["temp"]
         if units == "imperial":
-            temperature = (temperature * 9/5) + 32
-            
-        return WeatherResponse(
-            location=location.title(),
-            temperature=round(temperature, 1),
-            description=data["desc"],
-            humidity=data["humidity"],
-            wind_speed=data["wind"],
-            units=units
-        )
+            data = _MOCK_IMPERIAL.get(location.lower(), _MOCK_IMPERIAL_DEFAULT)
+        else:
+            data = _MOCK.get(location.lower(), _MOCK_DEFAULT)
+
+        return WeatherResponse(location=_title_cached(location), units=units, **data)
 
     async def get_weather_forecast(self, location: str, days: int = 5) -> Dict:
         """
-        Get weather forecast for multiple days.
+        Get weather forecast for multiple days, cached for 30 minutes.
         Returns mock data for demonstration.
         """
+        key = (location.lower(), days)
+        future = self._forecast_cache.get(key)
+        if future is not None:
+            return await future
+
+        future = asyncio.get_running_loop().create_future()
+        self._forecast_cache[key] = future
+        try:
+            result = await self._build_forecast(location, days)
+        except BaseException:
+            self._forecast_cache.pop(key, None)
+            future.cancel()
+            raise
+        future.set_result(result)
+        return result
+
+    async def _build_forecast(self, location: str, days: int) -> Dict:
         base_weather = await self.get_weather(location)
-        
+
         forecast = []
         for i in range(days):
             # Generate mock forecast data